@@ -0,0 +1,85 @@
+"""
+Bias marker lexicon for Oratio Backend
+Cheap local prefilter that decides whether a sentence needs an LLM analysis
+"""
+
+import re
+
+# Terms that commonly appear in biased sentences. A sentence containing none
+# of them is treated as neutral without calling an AI provider, so the list
+# errs on the side of recall (broad quantifiers and group nouns included).
+BIAS_MARKERS = (
+    # Gender
+    "he", "she", "him", "her", "his", "hers", "himself", "herself",
+    "man", "men", "woman", "women", "male", "female", "boy", "girl", "guy",
+    "lady", "ladies", "gentleman", "gentlemen", "wife", "husband", "mother",
+    "father", "mom", "dad", "housewife", "chairman", "manpower", "mankind",
+    "businessman", "policeman", "fireman", "feminine", "masculine", "girly",
+    "manly", "bossy", "hysterical", "emotional", "sissy", "gender",
+    # Age
+    "old", "older", "elderly", "young", "younger", "youth", "millennial",
+    "boomer", "senior", "aged", "geriatric", "teenager", "kid", "age",
+    # Ability
+    "disabled", "disability", "handicapped", "crippled", "lame", "blind",
+    "deaf", "dumb", "mute", "crazy", "insane", "psycho", "retarded",
+    "wheelchair", "autistic", "spastic", "mental", "invalid", "suffers",
+    "afflicted", "normal",
+    # Race and ethnicity
+    "race", "racial", "black", "white", "asian", "african", "hispanic",
+    "latino", "latina", "arab", "indian", "native", "ethnic", "immigrant",
+    "foreigner", "foreign", "exotic", "articulate", "illegal", "thug",
+    "brown", "colored", "caucasian", "oriental", "tribal", "mixed race",
+    "indigenous", "aboriginal", "eskimo", "gypsy", "roma", "romani",
+    "refugee", "migrant", "alien", "minority",
+    # Nationality
+    "american", "mexican", "canadian", "cuban", "haitian", "jamaican",
+    "puerto rican", "dominican", "brazilian", "colombian", "venezuelan",
+    "argentinian", "peruvian", "latin", "chinese", "japanese", "korean",
+    "vietnamese", "filipino", "thai", "indonesian", "malaysian", "pakistani",
+    "bangladeshi", "afghan", "iranian", "persian", "iraqi", "syrian",
+    "lebanese", "turkish", "kurdish", "israeli", "palestinian", "egyptian",
+    "nigerian", "somali", "ethiopian", "kenyan", "european", "british",
+    "english", "irish", "scottish", "welsh", "french", "german", "italian",
+    "spanish", "portuguese", "greek", "polish", "russian", "ukrainian",
+    "romanian", "albanian", "serbian", "dutch", "swedish", "australian",
+    # Religion
+    "religion", "religious", "muslim", "islam", "christian", "catholic",
+    "jew", "jewish", "hindu", "buddhist", "sikh", "atheist",
+    "mormon", "evangelical", "protestant", "pagan", "infidel", "heathen",
+    "cult", "jihad", "zionist",
+    # Sexual orientation and gender identity
+    "gay", "lesbian", "bisexual", "homosexual", "heterosexual", "straight",
+    "queer", "lgbt", "lgbtq", "transgender", "trans", "transsexual",
+    "nonbinary", "non-binary", "intersex", "asexual", "pronoun", "sexuality",
+    "orientation", "lifestyle", "unnatural", "sinful", "pervert", "deviant",
+    # Socioeconomic
+    "poor", "rich", "welfare", "ghetto", "trailer", "homeless", "uneducated",
+    "peasant", "elite", "class",
+    # Generalizations and stereotyping
+    "all", "every", "everyone", "always", "never", "typical", "typically",
+    "naturally", "those people", "you people", "these people", "belong",
+    "should stay", "inferior", "superior", "lazy", "primitive", "savage",
+    "aggressive", "weak", "criminal", "terrorist", "violent", "dangerous",
+    "dirty", "greedy", "cheap", "sneaky", "backward", "uncivilized",
+    # Toxic or offensive language
+    "hate", "idiot", "moron", "stupid", "ignorant", "ugly", "disgusting",
+    "freak",
+    # Slurs
+    "nigger", "nigga", "negro", "coon", "chink", "gook", "jap", "spic",
+    "beaner", "wetback", "kike", "raghead", "towelhead", "paki", "redskin",
+    "squaw", "cracker", "honky", "redneck", "hillbilly", "fag", "faggot",
+    "dyke", "tranny", "homo", "shemale", "retard", "midget", "spaz", "gimp",
+    "bitch", "slut", "whore",
+)
+
+# One alternation compiled at import; longer terms first so multi-word
+# markers win over their prefixes
+BIAS_MARKER_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(term) for term in sorted(BIAS_MARKERS, key=len, reverse=True)) + r")s?\b",
+    re.IGNORECASE
+)
+
+
+def has_bias_marker(sentence: str) -> bool:
+    """Return True if the sentence contains at least one bias marker term"""
+    return BIAS_MARKER_RE.search(sentence) is not None
@@ -2,31 +2,88 @@
 Configuration settings for Oratio Backend
 """
 
-import os
-
-# Security
-SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
-
-# Database (MySQL)
-MYSQL_HOST = os.getenv("MYSQL_HOST", "localhost")
-MYSQL_PORT = os.getenv("MYSQL_PORT", "3306")
-MYSQL_USER = os.getenv("MYSQL_USER", "root")
-MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD", "")
-MYSQL_DATABASE = os.getenv("MYSQL_DATABASE", "oratio")
-
-# Construct MySQL URL
-DATABASE_URL = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}"
-
-# Gemini API Configuration
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
-GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
-
-# CORS
-ALLOWED_ORIGINS = [
-    "http://localhost:3000",
-    "http://localhost:5173",
-    "http://127.0.0.1:3000",
-    "http://127.0.0.1:5173"
-]
+from functools import lru_cache
+from typing import List
+
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """Application settings, read from the environment and the .env file"""
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
+
+    # Security (required, no usable default)
+    secret_key: str
+    algorithm: str = "HS256"
+    access_token_expire_minutes: int = 30
+    bcrypt_rounds: int = 12
+
+    # Ops token for admin endpoints (X-Admin-Token header); empty disables them
+    admin_token: str = ""
+
+    # Database (MySQL)
+    mysql_host: str = "localhost"
+    mysql_port: str = "3306"
+    mysql_user: str = "root"
+    mysql_password: str = ""
+    mysql_database: str = "oratio"
+
+    # Connection pool budget for the whole server, split evenly across the
+    # WEB_CONCURRENCY worker processes (run.py sets it for its workers)
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    web_concurrency: int = 1
+    db_pool_timeout: float = 5
+    db_pool_recycle: int = 1800
+
+    # Run create_all on startup; disable when migrations are managed externally
+    db_auto_create_schema: bool = True
+
+    # Gemini API Configuration
+    gemini_api_key: str = ""
+    gemini_model: str = "gemini-1.5-flash"
+    gemini_max_concurrency: int = 8
+    gemini_startup_probe: bool = False
+    gemini_cooldown_seconds: float = 60  # Skip Gemini this long after a quota error
+
+    # Groq API Configuration (fallback)
+    groq_api_key: str = ""
+
+    # Maximum sentences sent to a provider in one call
+    analyze_batch_size: int = 20
+
+    # How long to collect concurrent requests into one provider call
+    batch_max_wait_ms: float = 20
+
+    # Skip the LLM for sentences with no bias marker term (see bias_lexicon.py).
+    # Off by default: a sentence the lexicon misses is reported as unbiased
+    bias_prefilter_enabled: bool = False
+
+    # CORS
+    allowed_origins: List[str] = [
+        "http://localhost:3000",
+        "http://localhost:5173",
+        "http://127.0.0.1:3000",
+        "http://127.0.0.1:5173"
+    ]
+
+    @field_validator("secret_key")
+    @classmethod
+    def _require_secret_key(cls, value: str) -> str:
+        """Fail closed instead of signing tokens with an empty or placeholder key"""
+        if not value.strip() or value == "your-secret-key-change-in-production":
+            raise ValueError("SECRET_KEY must be set in the environment or .env file")
+        return value
+
+    @property
+    def database_url(self) -> str:
+        """Construct MySQL URL"""
+        return f"mysql+pymysql://{self.mysql_user}:{self.mysql_password}@{self.mysql_host}:{self.mysql_port}/{self.mysql_database}"
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """Load settings once per process"""
+    return Settings()
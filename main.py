@@ -5,49 +5,66 @@ Using Google Gemini API for comprehensive bias detection
 
 import os
 import re
-import json
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+import orjson
+import asyncio
+import hashlib
+import hmac
+import time
+from datetime import datetime
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+from typing_extensions import TypedDict
 from contextlib import asynccontextmanager
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
-# Load environment variables first
-try:
-    import environment
-except ImportError:
-    print("⚠️ environment.py not found, using system environment variables")
-
-import google.generativeai as genai
-from groq import Groq
-from fastapi import FastAPI, HTTPException, Depends, status
+import httpx
+from groq import AsyncGroq
+from fastapi import FastAPI, HTTPException, Depends, Header, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, EmailStr
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean
+from sqlalchemy import create_engine, select, bindparam, text, Column, Integer, String, DateTime, Boolean
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-import secrets
-from passlib.context import CryptContext
+import jwt
+import bcrypt
+from cachetools import LRUCache, TTLCache
 
 # Configuration
-from config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, ALLOWED_ORIGINS, DATABASE_URL, GEMINI_API_KEY, GEMINI_MODEL
+from config import get_settings
+from bias_lexicon import has_bias_marker
 
-# Get Groq API key from environment
-GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
+settings = get_settings()
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
-# Database setup
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Hot users by email: (id, email, hashed_password)
+_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+# Analysis results by blake2b digest of the input text: (response dict, provider)
+_analysis_cache: TTLCache = TTLCache(maxsize=2048, ttl=3600)
+
+# Per-sentence provider results by (provider, sentence), stored as JSON bytes
+# so the cache holds compact immutable values. The key is the exact sentence
+# because cached span offsets and suggestions refer to it as written.
+_sentence_cache: LRUCache = LRUCache(maxsize=4096)
+
+# Sentence terminators used to split request text
+_SENT_RE = re.compile(r'[.!?]+')
+
+# Characters ignored when matching a model's echoed sentence to its input
+_ECHO_IGNORED_RE = re.compile(r'[\W_]+')
+
+# Database setup (engine and session factory are created on first use)
 Base = declarative_base()
 
 # Global models for fallback system
 gemini_model = None
 groq_client = None
-current_provider = "gemini"  # Track which provider is currently active
-gemini_quota_exceeded = False  # Track if Gemini quota is exceeded
+http_client = None  # Shared keep-alive HTTP client for provider SDKs
+gemini_retry_at = 0.0  # Monotonic time until which Gemini is skipped after a quota error
+gemini_semaphore = asyncio.Semaphore(settings.gemini_max_concurrency)  # Bound concurrent Gemini calls
 
 # Database Models
 class UserModel(Base):
@@ -69,6 +86,12 @@ class ChatHistoryModel(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     provider_used = Column(String(50), nullable=False)  # "gemini" or "groq"
 
+# Reusable user lookup statement; selects plain columns so no ORM object is
+# hydrated, and the email is bound per call
+_USER_BY_EMAIL = select(UserModel.id, UserModel.email, UserModel.hashed_password).where(
+    UserModel.email == bindparam("email")
+)
+
 class UserCreate(BaseModel):
     email: EmailStr
     password: str
@@ -111,19 +134,148 @@ class ChatHistoryResponse(BaseModel):
     history: List[ChatHistoryItem]
     total_count: int
 
+@lru_cache(maxsize=None)
+def get_engine():
+    """Create the database engine on first use"""
+    # Each worker process gets its share of the pool budget
+    workers = max(settings.web_concurrency, 1)
+    return create_engine(
+        settings.database_url,
+        pool_size=max(settings.db_pool_size // workers, 1),
+        max_overflow=settings.db_max_overflow // workers,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=True,
+        pool_use_lifo=True  # Reuse the most recent connection so idle overflow connections age out
+    )
+
+@lru_cache(maxsize=None)
+def get_session_factory():
+    """Create the session factory bound to the engine on first use"""
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+
+# Bias detection prompt, kept constant so providers can cache the prefix;
+# Gemini gets it once per model as its system instruction
+BIAS_SYSTEM_PROMPT = """
+The user message is a JSON array of sentences. Analyze each sentence for bias and
+provide a detailed analysis.
+
+Return exactly one entry in "sentences" per input sentence, in the same order.
+For each sentence, list every biased span with its text, its start and end position
+in the sentence, and its bias type (gender_bias, racial_bias, ageist, ableist,
+religious_bias, etc.), and give a neutral alternative for the sentence as the
+suggestion.
+
+Guidelines for bias detection:
+1. Look for gender bias (stereotypes about men/women abilities)
+2. Look for racial/ethnic bias
+3. Look for ageist language (discrimination based on age)
+4. Look for ableist language (discrimination against disabilities)
+5. Look for religious bias
+6. Look for socioeconomic bias
+7. Look for toxic or offensive language
+8. Look for stereotyping or generalizations
+
+Provide neutral, inclusive alternatives for any biased language found.
+If no bias is found, set biased_count to 0 and score to 0.0.
+"""
+
+# Groq has no response schema, so its system prompt also spells out the format
+GROQ_SYSTEM_PROMPT = BIAS_SYSTEM_PROMPT + """
+Respond with JSON only, in the following format:
+{
+    "biased_count": <number of biased elements found>,
+    "score": <overall bias score from 0.0 to 1.0>,
+    "sentences": [
+        {
+            "sentence": "<the sentence>",
+            "biased_spans": [
+                {
+                    "text": "<biased text>",
+                    "start": <start position>,
+                    "end": <end position>,
+                    "type": "<bias type: gender_bias, racial_bias, ageist, ableist, religious_bias, etc.>"
+                }
+            ],
+            "suggestion": "<neutral alternative>"
+        }
+    ]
+}
+"""
+
+# Response schema enforced by Gemini's JSON mode
+class BiasedSpanSchema(TypedDict):
+    text: str
+    start: int
+    end: int
+    type: str
+
+class SentenceAnalysisSchema(TypedDict):
+    sentence: str
+    biased_spans: List[BiasedSpanSchema]
+    suggestion: str
+
+class AnalysisSchema(TypedDict):
+    biased_count: int
+    score: float
+    sentences: List[SentenceAnalysisSchema]
+
+# Bump when the models change so the next boot re-runs create_all
+SCHEMA_VERSION = 1
+
 def init_database():
     """Initialize MySQL database with users table"""
     try:
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
+        with get_engine().begin() as connection:
+            # Skip table introspection when this schema version is already recorded
+            connection.execute(text(
+                "CREATE TABLE IF NOT EXISTS _schema_version (id TINYINT PRIMARY KEY, v INT NOT NULL)"
+            ))
+            version = connection.execute(text("SELECT v FROM _schema_version WHERE id = 1")).scalar_one_or_none()
+            if version == SCHEMA_VERSION:
+                print(f"✅ Database schema up to date (version {SCHEMA_VERSION})")
+                return
+            
+            # Create all tables
+            Base.metadata.create_all(bind=connection)
+            connection.execute(
+                text("REPLACE INTO _schema_version (id, v) VALUES (1, :v)"),
+                {"v": SCHEMA_VERSION}
+            )
         print("✅ Database tables created successfully")
     except Exception as e:
         print(f"❌ Error creating database tables: {e}")
         raise
 
+def warm_connection_pool():
+    """Open pool_size connections up front so the first requests skip the handshake"""
+    engine = get_engine()
+    connections = []
+    try:
+        # Hold every connection open at once so each one is a new checkout
+        for _ in range(engine.pool.size()):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+        print(f"✅ Database connection pool warmed ({len(connections)} connections)")
+    except Exception as e:
+        # Don't block API startup if the database is unreachable
+        print(f"⚠️ Failed to warm database connection pool: {e}")
+    finally:
+        for connection in connections:
+            connection.close()  # Returns the warmed connection to the pool
+
+def prepare_database():
+    """Create the schema (unless disabled) and warm the connection pool"""
+    if settings.db_auto_create_schema:
+        init_database()
+    else:
+        print("⏭️ Skipping schema creation (DB_AUTO_CREATE_SCHEMA disabled)")
+    warm_connection_pool()
+
 def get_db():
     """Get database session"""
-    db = SessionLocal()
+    db = get_session_factory()()
     try:
         yield db
     finally:
@@ -131,53 +283,118 @@ def get_db():
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(settings.bcrypt_rounds)).decode()
 
 def create_access_token(data: dict) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = secrets.token_urlsafe(32)  # Simple token for demo
+    to_encode["exp"] = int(time.time()) + settings.access_token_expire_minutes * 60
+    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
+def _lookup_user(db: Session, email: str) -> Optional[Tuple[int, str, str]]:
+    """Get (id, email, hashed_password) for a user, served from the TTL cache when possible"""
+    cached = _user_cache.get(email)
+    if cached is None:
+        row = db.execute(_USER_BY_EMAIL, {"email": email}).first()
+        if not row:
+            return None
+        cached = tuple(row)
+        _user_cache[email] = cached
+    return cached
+
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     """Get user by email from database"""
-    user = db.query(UserModel).filter(UserModel.email == email).first()
+    user = _lookup_user(db, email)
     if user:
-        return User(id=user.id, email=user.email)
+        return User(id=user[0], email=user[1])
     return None
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+async def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     """Authenticate user with email and password"""
-    user = db.query(UserModel).filter(UserModel.email == email).first()
-    if user and verify_password(password, user.hashed_password):
-        return User(id=user.id, email=user.email)
+    user = _lookup_user(db, email)
+    # bcrypt is CPU-bound; run it on the executor so the event loop stays free
+    if user and await asyncio.to_thread(verify_password, password, user[2]):
+        return User(id=user[0], email=user[1])
     return None
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), 
-                    db: Session = Depends(get_db)) -> User:
-    """Get current authenticated user"""
-    # Simple token validation for demo - in production use proper JWT
-    if not credentials.credentials:
+def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
+    """Get current authenticated user from the signed token, without a database lookup"""
+    try:
+        payload = jwt.decode(credentials.credentials, settings.secret_key, algorithms=[settings.algorithm])
+        return User(id=payload["uid"], email=payload["sub"])
+    except (jwt.PyJWTError, KeyError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+def require_admin_token(x_admin_token: str = Header(default="")):
+    """Allow ops callers presenting the configured ADMIN_TOKEN; admin endpoints are off without one"""
+    if not settings.admin_token or not hmac.compare_digest(x_admin_token.encode(), settings.admin_token.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin token required"
+        )
+
+async def _probe_gemini():
+    """Test the Gemini connection (opt-in, costs a round-trip on every boot)"""
+    if not gemini_model:
+        return
+    if not settings.gemini_startup_probe:
+        print(f"✅ Gemini API configured (startup probe disabled)")
+        print(f"Model: {settings.gemini_model}")
+        return
+    
+    try:
+        test_response = await gemini_model.generate_content_async("Hello, this is a test.")
+        print(f"✅ Gemini API initialized successfully")
+        print(f"Model: {settings.gemini_model}")
+        print(f"Test response: {test_response.text[:50]}...")
+    except Exception as test_error:
+        if "quota" in str(test_error).lower() or "429" in str(test_error):
+            print(f"⚠️ Gemini API initialized but quota exceeded")
+            print(f"Model: {settings.gemini_model}")
+            _open_gemini_circuit()
+        else:
+            print(f"⚠️ Gemini API initialized but test failed: {test_error}")
+            print(f"Model: {settings.gemini_model}")
+
+async def _probe_groq():
+    """Test the Groq connection"""
+    if not groq_client:
+        return
     
-    # For demo purposes, we'll just return a mock user
-    # In production, decode JWT and get user from database
-    return User(id=1, email="demo@example.com")
+    try:
+        test_response = await groq_client.chat.completions.create(
+            messages=[{"role": "user", "content": "Hello, this is a test."}],
+            model="llama-3.1-8b-instant",
+            max_tokens=10
+        )
+        print(f"✅ Groq API initialized successfully")
+        print(f"Model: llama-3.1-8b-instant")
+        print(f"Test response: {test_response.choices[0].message.content[:50]}...")
+    except Exception as test_error:
+        print(f"⚠️ Groq API initialized but test failed: {test_error}")
+        print("Fallback will be attempted but may not work")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize AI APIs with fallback system"""
-    global gemini_model, groq_client, current_provider, gemini_quota_exceeded
+    global gemini_model, groq_client, http_client
+    
+    # Size the default executor used for bcrypt and other offloaded work
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 2)
+    )
+    
+    # Initialize database on a worker thread so it overlaps with AI API setup
+    database_ready = asyncio.create_task(asyncio.to_thread(prepare_database))
     
     print("Initializing AI APIs with fallback system...")
     print("=" * 60)
@@ -185,33 +402,27 @@ async def lifespan(app: FastAPI):
     # Initialize Gemini API
     print("🤖 Initializing Gemini API...")
     try:
-        if not GEMINI_API_KEY:
+        import google.generativeai as genai
+        
+        if not settings.gemini_api_key:
             print("❌ GEMINI_API_KEY not found in environment variables")
             raise ValueError("GEMINI_API_KEY is required")
         
-        genai.configure(api_key=GEMINI_API_KEY)
-        gemini_model = genai.GenerativeModel(GEMINI_MODEL)
-        
-        # Test Gemini connection
-        try:
-            test_response = gemini_model.generate_content("Hello, this is a test.")
-            print(f"✅ Gemini API initialized successfully")
-            print(f"Model: {GEMINI_MODEL}")
-            print(f"Test response: {test_response.text[:50]}...")
-        except Exception as test_error:
-            if "quota" in str(test_error).lower() or "429" in str(test_error):
-                print(f"⚠️ Gemini API initialized but quota exceeded")
-                print(f"Model: {GEMINI_MODEL}")
-                gemini_quota_exceeded = True
-            else:
-                print(f"⚠️ Gemini API initialized but test failed: {test_error}")
-                print(f"Model: {GEMINI_MODEL}")
+        genai.configure(api_key=settings.gemini_api_key)
+        gemini_model = genai.GenerativeModel(
+            settings.gemini_model,
+            system_instruction=BIAS_SYSTEM_PROMPT,
+            generation_config={
+                "response_mime_type": "application/json",
+                "response_schema": AnalysisSchema
+            }
+        )
         
     except Exception as e:
         print(f"❌ Error initializing Gemini API: {e}")
         if "quota" in str(e).lower() or "429" in str(e):
             print("⚠️ Quota exceeded - will use fallback when available")
-            gemini_quota_exceeded = True
+            _open_gemini_circuit()
         else:
             print("❌ Gemini API failed to initialize")
             gemini_model = None
@@ -219,71 +430,70 @@ async def lifespan(app: FastAPI):
     # Initialize Groq API (fallback)
     print("\n🚀 Initializing Groq API (fallback)...")
     try:
-        if not GROQ_API_KEY or GROQ_API_KEY == "your_groq_api_key_here":
+        if not settings.groq_api_key or settings.groq_api_key == "your_groq_api_key_here":
             print("⚠️ GROQ_API_KEY not set - fallback will not be available")
             print("Set GROQ_API_KEY in .env file to enable fallback")
         else:
-            groq_client = Groq(api_key=GROQ_API_KEY)
-            
-            # Test Groq connection
-            try:
-                test_response = groq_client.chat.completions.create(
-                    messages=[{"role": "user", "content": "Hello, this is a test."}],
-                    model="llama-3.1-8b-instant",
-                    max_tokens=10
-                )
-                print(f"✅ Groq API initialized successfully")
-                print(f"Model: llama-3.1-8b-instant")
-                print(f"Test response: {test_response.choices[0].message.content[:50]}...")
-            except Exception as test_error:
-                print(f"⚠️ Groq API initialized but test failed: {test_error}")
-                print("Fallback will be attempted but may not work")
+            # One pooled HTTP/2 client so every Groq call reuses warm TCP/TLS
+            # connections and concurrent calls multiplex over them
+            http_client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+            groq_client = AsyncGroq(api_key=settings.groq_api_key, http_client=http_client)
         
     except Exception as e:
         print(f"❌ Error initializing Groq API: {e}")
         groq_client = None
     
-    # Determine active provider
-    if gemini_model and not gemini_quota_exceeded:
-        current_provider = "gemini"
-        print(f"\n🎯 Active provider: Gemini ({GEMINI_MODEL})")
-    elif groq_client:
-        current_provider = "groq"
+    # Test both connections concurrently
+    await asyncio.gather(_probe_gemini(), _probe_groq(), return_exceptions=True)
+    
+    # Report the active provider
+    active_provider = _current_provider()
+    if active_provider == "gemini":
+        print(f"\n🎯 Active provider: Gemini ({settings.gemini_model})")
+    elif active_provider == "groq":
         print(f"\n🎯 Active provider: Groq (llama-3.1-8b-instant)")
     else:
-        current_provider = "none"
         print(f"\n❌ No AI providers available!")
     
     print("=" * 60)
     
+    await database_ready
+    
+    analysis_batcher.start()
+    
     yield
     
     # Cleanup on shutdown
     print("Shutting down...")
+    await analysis_batcher.stop()
+    if http_client:
+        await http_client.aclose()
+        http_client = None
 
 app = FastAPI(
     title="Oratio Bias Detection API",
     description="AI-powered text bias detection using Google Gemini API",
     version="2.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=ALLOWED_ORIGINS,
+    allow_origins=settings.allowed_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
-# Initialize database
-init_database()
-
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "ok", "timestamp": datetime.utcnow().isoformat()}
+    return {"status": "ok", "timestamp": time.time()}
 
 @app.post("/auth/signup", response_model=Dict[str, str])
 async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
@@ -297,23 +507,25 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await asyncio.to_thread(get_password_hash, user_data.password)
     db_user = UserModel(
         email=user_data.email,
         hashed_password=hashed_password
     )
     db.add(db_user)
+    db.flush()  # INSERT assigns the id; read it before commit expires the instance
+    user_id = db_user.id
     db.commit()
-    db.refresh(db_user)
+    _user_cache.pop(user_data.email, None)
     
     # Generate access token
-    access_token = create_access_token({"sub": user_data.email})
+    access_token = create_access_token({"sub": user_data.email, "uid": user_id})
     return {"access_token": access_token}
 
 @app.post("/auth/login", response_model=Dict[str, str])
 async def login(user_data: UserLogin, db: Session = Depends(get_db)):
     """User authentication"""
-    user = authenticate_user(db, user_data.email, user_data.password)
+    user = await authenticate_user(db, user_data.email, user_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -321,7 +533,7 @@ async def login(user_data: UserLogin, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token = create_access_token({"sub": user.email})
+    access_token = create_access_token({"sub": user.email, "uid": user.id})
     return {"access_token": access_token}
 
 @app.get("/auth/me", response_model=User)
@@ -329,7 +541,7 @@ async def get_me(current_user: User = Depends(get_current_user)):
     """Get current user information"""
     return current_user
 
-def analyze_text_with_groq(text: str) -> Dict[str, Any]:
+async def analyze_text_with_groq(sentences: List[str]) -> Dict[str, Any]:
     """Analyze text for bias using Groq API (fallback)"""
     if not groq_client:
         raise HTTPException(
@@ -337,73 +549,33 @@ def analyze_text_with_groq(text: str) -> Dict[str, Any]:
             detail="Groq API not available"
         )
     
-    # Create a comprehensive prompt for bias detection
-    prompt = f"""
-    Analyze the following text for bias and provide a detailed analysis in JSON format.
-
-    Text to analyze: "{text}"
-
-    Please provide your analysis in the following JSON format:
-    {{
-        "biased_count": <number of biased elements found>,
-        "score": <overall bias score from 0.0 to 1.0>,
-        "sentences": [
-            {{
-                "sentence": "<the sentence>",
-                "biased_spans": [
-                    {{
-                        "text": "<biased text>",
-                        "start": <start position>,
-                        "end": <end position>,
-                        "type": "<bias type: gender_bias, racial_bias, ageist, ableist, religious_bias, etc.>"
-                    }}
-                ],
-                "suggestion": "<neutral alternative>"
-            }}
-        ]
-    }}
-
-    Guidelines for bias detection:
-    1. Look for gender bias (stereotypes about men/women abilities)
-    2. Look for racial/ethnic bias
-    3. Look for ageist language (discrimination based on age)
-    4. Look for ableist language (discrimination against disabilities)
-    5. Look for religious bias
-    6. Look for socioeconomic bias
-    7. Look for toxic or offensive language
-    8. Look for stereotyping or generalizations
-
-    Provide neutral, inclusive alternatives for any biased language found.
-    If no bias is found, set biased_count to 0 and score to 0.0.
-    """
-    
     try:
-        response = groq_client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
+        response = await groq_client.chat.completions.create(
+            messages=[
+                {"role": "system", "content": GROQ_SYSTEM_PROMPT},
+                {"role": "user", "content": orjson.dumps(sentences).decode()}
+            ],
             model="llama-3.1-8b-instant",
             max_tokens=2000,
-            temperature=0.1
+            temperature=0.1,
+            response_format={"type": "json_object"}
         )
         
-        # Parse the JSON response
-        response_text = response.choices[0].message.content.strip()
+        # JSON mode guarantees a bare JSON object, so parse it directly
+        response_text = response.choices[0].message.content
+        analysis = orjson.loads(response_text)
         
-        # Try to extract JSON from the response
-        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-        if json_match:
-            analysis = json.loads(json_match.group())
-            return analysis
-        else:
-            # Fallback if JSON parsing fails
-            return {
-                "biased_count": 0,
-                "score": 0.0,
-                "sentences": [{
-                    "sentence": text,
-                    "biased_spans": [],
-                    "suggestion": text
-                }]
-            }
+        return analysis
+        
+    except orjson.JSONDecodeError as e:
+        print(f"JSON parsing error: {e}")
+        print(f"Raw response: {response_text}")
+        # Fallback to simple analysis
+        return {
+            "biased_count": 0,
+            "score": 0.0,
+            "sentences": []
+        }
     except Exception as e:
         print(f"Groq API error: {e}")
         error_str = str(e)
@@ -418,39 +590,42 @@ def analyze_text_with_groq(text: str) -> Dict[str, Any]:
                 detail=f"Error analyzing text with Groq: {error_str}"
             )
 
-def analyze_text_with_fallback(text: str) -> Dict[str, Any]:
-    """Analyze text with automatic fallback between Gemini and Groq"""
-    global current_provider, gemini_quota_exceeded
-    
-    # Try Gemini first if available and quota not exceeded
-    if current_provider == "gemini" and gemini_model and not gemini_quota_exceeded:
+def _gemini_circuit_open() -> bool:
+    """True while Gemini is cooling down after a quota error"""
+    return time.monotonic() < gemini_retry_at
+
+def _open_gemini_circuit():
+    """Stop sending requests to Gemini for the configured cooldown"""
+    global gemini_retry_at
+    gemini_retry_at = time.monotonic() + settings.gemini_cooldown_seconds
+
+def _current_provider() -> str:
+    """Provider the next analysis goes to first, derived from the Gemini circuit"""
+    if gemini_model and not _gemini_circuit_open():
+        return "gemini"
+    return "groq" if groq_client else "none"
+
+async def analyze_text_with_fallback(sentences: List[str]) -> Tuple[Dict[str, Any], str]:
+    """Analyze text with automatic fallback between Gemini and Groq; returns the analysis and the provider used"""
+    # Try Gemini first unless its circuit is open after a recent quota error
+    if gemini_model and not _gemini_circuit_open():
         try:
-            return analyze_text_with_gemini(text)
+            return await analyze_text_with_gemini(sentences), "gemini"
         except Exception as e:
             error_str = str(e)
             if "quota" in error_str.lower() or "429" in error_str:
-                print("🔄 Gemini quota exceeded, switching to Groq fallback...")
-                gemini_quota_exceeded = True
-                current_provider = "groq"
-                # Fall through to try Groq
+                print(f"🔄 Gemini quota exceeded, using Groq fallback for {settings.gemini_cooldown_seconds:g}s...")
+                _open_gemini_circuit()
             else:
                 print(f"❌ Gemini error: {e}")
-                # Fall through to try Groq
+            # Fall through to try Groq
     
-    # Try Groq if available
-    if current_provider == "groq" and groq_client:
+    # Try Groq if available; Gemini is not retried in the same call
+    if groq_client:
         try:
-            return analyze_text_with_groq(text)
+            return await analyze_text_with_groq(sentences), "groq"
         except Exception as e:
             print(f"❌ Groq error: {e}")
-            # If Groq also fails, try to fall back to Gemini if quota reset
-            if gemini_model and not gemini_quota_exceeded:
-                print("🔄 Trying Gemini again...")
-                current_provider = "gemini"
-                try:
-                    return analyze_text_with_gemini(text)
-                except Exception as gemini_error:
-                    print(f"❌ Gemini still failing: {gemini_error}")
     
     # If both fail, return error
     raise HTTPException(
@@ -458,7 +633,169 @@ def analyze_text_with_fallback(text: str) -> Dict[str, Any]:
         detail="All AI providers are currently unavailable. Please try again later."
     )
 
-def analyze_text_with_gemini(text: str) -> Dict[str, Any]:
+def _same_sentence(echoed: Any, sentence: str) -> bool:
+    """True if a model's echoed sentence is the input sentence, ignoring case, spacing and punctuation"""
+    if not isinstance(echoed, str):
+        return False
+    return _ECHO_IGNORED_RE.sub("", echoed).lower() == _ECHO_IGNORED_RE.sub("", sentence).lower()
+
+def _results_aligned(sentences: List[str], results: List[Any]) -> bool:
+    """True if the model returned exactly one entry per sentence, each echoing its sentence"""
+    return len(results) == len(sentences) and all(
+        isinstance(result, dict) and _same_sentence(result.get("sentence"), sentence)
+        for result, sentence in zip(results, sentences)
+    )
+
+class SentenceBatcher:
+    """Packs sentence batches from concurrent requests into shared provider calls
+    
+    Requests submit their sentences and await a future. A background task
+    sends a lone request at once; while a call is already in flight it
+    collects submissions for up to max_wait seconds (or until max_sentences
+    are queued) and sends them as one analyze_text_with_fallback call. Each
+    request gets back its slice of the results only if every entry lines up
+    with its input; otherwise the requests are re-sent separately.
+    """
+    
+    def __init__(self, max_sentences: int, max_wait: float):
+        self.max_sentences = max_sentences
+        self.max_wait = max_wait
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._carry = None  # Submission that did not fit in the previous batch
+        self._task = None
+        self._inflight = set()  # Keeps dispatch tasks referenced until they finish
+    
+    def start(self):
+        """Start the background collection task"""
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Stop collecting and fail any submissions still waiting"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        pending = [self._carry] if self._carry else []
+        self._carry = None
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Analysis batcher stopped"))
+    
+    async def submit(self, sentences: List[str]) -> Tuple[Dict[str, Any], str]:
+        """Queue sentences for analysis and wait for their share of the batch result"""
+        if self._task is None:
+            return await analyze_text_with_fallback(sentences)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((sentences, future))
+        return await future
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            first = self._carry or await self._queue.get()
+            self._carry = None
+            items = [first]
+            size = len(first[0])
+            # An idle provider has nothing to wait for, so only hold the batch
+            # open while another call is in flight; queued items always join
+            deadline = loop.time() + (self.max_wait if self._inflight else 0)
+            while size < self.max_sentences:
+                if self._queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    item = self._queue.get_nowait()
+                if size + len(item[0]) > self.max_sentences:
+                    self._carry = item
+                    break
+                items.append(item)
+                size += len(item[0])
+            # Dispatch without blocking collection of the next batch
+            task = asyncio.create_task(self._dispatch(items))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+    
+    async def _dispatch(self, items):
+        sentences = [sentence for batch, _ in items for sentence in batch]
+        try:
+            analysis, provider = await analyze_text_with_fallback(sentences)
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        results = analysis.get("sentences") or []
+        if len(items) > 1 and not _results_aligned(sentences, results):
+            # Slicing a misaligned pack would hand one request entries for
+            # another request's sentences; send each request on its own instead
+            print(f"⚠️ Packed batch of {len(items)} requests came back misaligned, re-sending separately")
+            await asyncio.gather(*(self._dispatch([item]) for item in items))
+            return
+        
+        offset = 0
+        for batch, future in items:
+            if not future.done():
+                future.set_result(({"sentences": results[offset:offset + len(batch)]}, provider))
+            offset += len(batch)
+
+analysis_batcher = SentenceBatcher(
+    max_sentences=settings.analyze_batch_size,
+    max_wait=settings.batch_max_wait_ms / 1000
+)
+
+async def _read_json_stream(response) -> str:
+    """Collect streamed model output up to the end of the top-level JSON object
+    
+    The stream is always read to the end so the RPC finishes while the caller
+    still holds its Gemini semaphore slot.
+    """
+    chunks = []
+    document = None
+    depth = 0
+    in_string = False
+    escaped = False
+    async for chunk in response:
+        if document is not None:
+            continue  # Drain trailing output without parsing it
+        piece = chunk.text
+        for i, char in enumerate(piece):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"' and depth:
+                in_string = True
+            elif char == "{":
+                depth += 1
+            elif char == "}" and depth:
+                depth -= 1
+                if depth == 0:
+                    chunks.append(piece[:i + 1])
+                    joined = "".join(chunks)
+                    document = joined[joined.index("{"):]
+                    break
+        else:
+            chunks.append(piece)
+    if document is not None:
+        return document
+    # Stream ended without a complete object; let the caller's parser report it
+    return "".join(chunks)
+
+async def analyze_text_with_gemini(sentences: List[str]) -> Dict[str, Any]:
     """Analyze text for bias using Gemini API"""
     if not gemini_model:
         raise HTTPException(
@@ -466,75 +803,26 @@ def analyze_text_with_gemini(text: str) -> Dict[str, Any]:
             detail="Gemini API not available"
         )
     
-    # Create a comprehensive prompt for bias detection
-    prompt = f"""
-    Analyze the following text for bias and provide a detailed analysis in JSON format.
-
-    Text to analyze: "{text}"
-
-    Please provide your analysis in the following JSON format:
-    {{
-        "biased_count": <number of biased elements found>,
-        "score": <overall bias score from 0.0 to 1.0>,
-        "sentences": [
-            {{
-                "sentence": "<the sentence>",
-                "biased_spans": [
-                    {{
-                        "text": "<biased text>",
-                        "start": <start position>,
-                        "end": <end position>,
-                        "type": "<bias type: gender_bias, racial_bias, ageist, ableist, religious_bias, etc.>"
-                    }}
-                ],
-                "suggestion": "<neutral alternative>"
-            }}
-        ]
-    }}
-
-    Guidelines for bias detection:
-    1. Look for gender bias (stereotypes about men/women abilities)
-    2. Look for racial/ethnic bias
-    3. Look for ageist language (discrimination based on age)
-    4. Look for ableist language (discrimination against disabilities)
-    5. Look for religious bias
-    6. Look for socioeconomic bias
-    7. Look for toxic or offensive language
-    8. Look for stereotyping or generalizations
-
-    Provide neutral, inclusive alternatives for any biased language found.
-    If no bias is found, set biased_count to 0 and score to 0.0.
-    """
-    
     try:
-        response = gemini_model.generate_content(prompt)
-        
-        # Parse the JSON response
-        response_text = response.text.strip()
-        
-        # Remove any markdown formatting if present
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
+        async with gemini_semaphore:
+            # The system instruction and response schema are set on the model,
+            # so the per-call payload is just the sentences
+            response = await gemini_model.generate_content_async(orjson.dumps(sentences).decode(), stream=True)
+            response_text = await _read_json_stream(response)
         
         # Parse JSON
-        analysis = json.loads(response_text)
+        analysis = orjson.loads(response_text)
         
         return analysis
         
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"JSON parsing error: {e}")
-        print(f"Raw response: {response.text}")
+        print(f"Raw response: {response_text}")
         # Fallback to simple analysis
         return {
             "biased_count": 0,
             "score": 0.0,
-            "sentences": [{
-                "sentence": text,
-                "biased_spans": [],
-                "suggestion": text
-            }]
+            "sentences": []
         }
     except Exception as e:
         print(f"Gemini API error: {e}")
@@ -550,99 +838,258 @@ def analyze_text_with_gemini(text: str) -> Dict[str, Any]:
                 detail=f"Error analyzing text: {error_str}"
             )
 
-@app.post("/analyze", response_model=AnalyzeResponse)
-async def analyze_text(request: AnalyzeRequest, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    """Analyze text for bias using AI with automatic fallback"""
-    text = request.text.strip()
-    if not text:
-        raise HTTPException(status_code=400, detail="Text cannot be empty")
-    
-    # Split into sentences
-    sentences = re.split(r'[.!?]+', text)
-    sentences = [s.strip() for s in sentences if s.strip()]
-    
-    if not sentences:
-        raise HTTPException(status_code=400, detail="No valid sentences found")
-    
-    sentence_analyses = []
-    total_biased_count = 0
+def _to_sentence_analysis(sentence: str, sentence_data: Dict[str, Any]) -> SentenceAnalysis:
+    """Build a validated SentenceAnalysis from provider output"""
+    biased_spans = sentence_data.get("biased_spans", [])
+    suggestion = sentence_data.get("suggestion", sentence)
+    return SentenceAnalysis(
+        sentence=sentence,
+        biased_spans=[BiasedSpan(**span) for span in biased_spans],
+        suggestion=suggestion
+    )
+
+async def _analyze_sentences(sentences: List[str]) -> AsyncIterator[Tuple[Optional[str], List[Tuple[int, SentenceAnalysis]], bool]]:
+    """Yield (provider, [(index, analysis), ...], complete) as results become available
     
-    for sentence in sentences:
-        if not sentence:
+    complete is False when a sentence sent to a provider got no usable entry
+    back; provider is None for a batch that failed outright.
+    """
+    # Sentences without any bias marker term are reported as unbiased
+    # locally; only the rest are sent to a provider. Repeated sentences are
+    # analyzed once and the result is shared by every occurrence.
+    pending: Dict[str, List[int]] = {}
+    for index, sentence in enumerate(sentences):
+        if not settings.bias_prefilter_enabled or has_bias_marker(sentence):
+            pending.setdefault(sentence, []).append(index)
+    if not pending:
+        yield "local", [], True
+        return
+
+    # Serve sentences the active provider has already analyzed from the cache
+    active_provider = _current_provider()
+    hits = []
+    misses = []
+    for sentence, indices in pending.items():
+        cached = _sentence_cache.get((active_provider, sentence.strip()))
+        if cached is None:
+            misses.append(sentence)
             continue
-        
-        try:
-            # Analyze each sentence with fallback system
-            analysis = analyze_text_with_fallback(sentence)
-            
-            # Extract sentence analysis
-            sentence_data = analysis.get("sentences", [{}])[0] if analysis.get("sentences") else {}
-            
-            biased_spans = sentence_data.get("biased_spans", [])
-            suggestion = sentence_data.get("suggestion", sentence)
-            
-            # Convert to BiasedSpan objects
-            biased_span_objects = [
-                BiasedSpan(**span) for span in biased_spans
-            ]
-            
-            sentence_analyses.append(SentenceAnalysis(
-                sentence=sentence,
-                biased_spans=biased_span_objects,
-                suggestion=suggestion
-            ))
-            
-            total_biased_count += len(biased_spans)
-            
-        except Exception as e:
-            print(f"Error analyzing sentence '{sentence}': {e}")
-            # Fallback: no bias detected
-            sentence_analyses.append(SentenceAnalysis(
-                sentence=sentence,
-                biased_spans=[],
-                suggestion=sentence
-            ))
-    
+        sentence_analysis = _to_sentence_analysis(sentence, orjson.loads(cached))
+        hits.extend((index, sentence_analysis) for index in indices)
+    if hits:
+        yield active_provider, hits, True
+
+    # Analyze the remaining sentences in as few calls as the prompt size allows;
+    # each call returns one entry per sentence, aligned by index. Batches run
+    # concurrently so long texts cost roughly one round-trip, and the batcher
+    # packs them together with other requests' sentences when it can.
+    async def analyze_batch(batch: List[str]):
+        return batch, await analysis_batcher.submit(batch)
+
+    batch_size = settings.analyze_batch_size
+    tasks = [
+        asyncio.ensure_future(analyze_batch(misses[i:i + batch_size]))
+        for i in range(0, len(misses), batch_size)
+    ]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            try:
+                batch, (analysis, batch_provider) = await next_result
+            except Exception as e:
+                print(f"Error analyzing text: {e}")
+                yield None, [], False
+                continue
+            sentence_results = analysis.get("sentences") or []
+            results = []
+            answered = 0
+            for sentence_data, sentence in zip(sentence_results, batch):
+                try:
+                    # Entries that don't echo their sentence are misaligned; drop them
+                    if sentence_data and _same_sentence(sentence_data.get("sentence"), sentence):
+                        sentence_analysis = _to_sentence_analysis(sentence, sentence_data)
+                        results.extend((index, sentence_analysis) for index in pending[sentence])
+                        answered += 1
+                        _sentence_cache[(batch_provider, sentence.strip())] = orjson.dumps(sentence_data)
+                except Exception as e:
+                    print(f"Error parsing sentence analysis {sentence_data!r}: {e}")
+            # Unparseable output comes back as no entries at all, and a short
+            # answer leaves sentences out; neither counts as a real analysis
+            yield batch_provider, results, answered == len(batch)
+    finally:
+        # A client that disconnects mid-stream closes the generator early
+        for task in tasks:
+            task.cancel()
+
+def _unbiased(sentence: str) -> SentenceAnalysis:
+    """Analysis for a sentence that was skipped, failed, or not returned by the model"""
+    return SentenceAnalysis(sentence=sentence, biased_spans=[], suggestion=sentence)
+
+def _summarize(sentence_analyses: List[SentenceAnalysis]) -> Dict[str, Any]:
+    """Biased span count and bias score for a list of sentence analyses"""
+    total_biased_count = sum(len(s.biased_spans) for s in sentence_analyses)
+
     # Calculate bias score
-    bias_score = min(total_biased_count / len(sentences), 1.0) if sentences else 0.0
-    
+    bias_score = min(total_biased_count / len(sentence_analyses), 1.0) if sentence_analyses else 0.0
+    return {
+        "biased_count": total_biased_count,
+        "score": round(bias_score, 2)
+    }
+
+async def _run_analysis(text: str, sentences: List[str]) -> Tuple[AnalyzeResponse, Optional[str]]:
+    """Analyze text with the AI providers; the provider is None unless every sentence sent was answered"""
+    provider = None
+    all_analyzed = True
+    analyzed: List[Optional[SentenceAnalysis]] = [None] * len(sentences)
+    async for step_provider, results, complete in _analyze_sentences(sentences):
+        all_analyzed = all_analyzed and complete
+        provider = provider or step_provider
+        for index, sentence_analysis in results:
+            analyzed[index] = sentence_analysis
+
+    # Unanswered sentences are shown as unbiased, but then provider is None
+    # so the response is never cached as a real answer
+    sentence_analyses = [
+        sentence_analysis or _unbiased(sentence)
+        for sentence_analysis, sentence in zip(analyzed, sentences)
+    ]
+
     # Create response
     response = AnalyzeResponse(
         original_text=text,
-        summary={
-            "biased_count": total_biased_count,
-            "score": round(bias_score, 2)
-        },
+        summary=_summarize(sentence_analyses),
         sentences=sentence_analyses
     )
+    return response, provider if all_analyzed else None
+
+def _split_sentences(text: str) -> Tuple[str, List[str]]:
+    """Validate and split request text; raises 400 for empty input"""
+    text = text.strip()
+    if not text:
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
     
-    # Save to chat history
+    # Split into sentences
+    sentences = [s for s in map(str.strip, _SENT_RE.split(text)) if s]
+    
+    if not sentences:
+        raise HTTPException(status_code=400, detail="No valid sentences found")
+    return text, sentences
+
+def _save_chat_history(db: Session, user_id: int, text: str, response_data: Dict[str, Any], provider: Optional[str]):
+    """Save an analysis to the user's chat history"""
     try:
-        global current_provider
         chat_history = ChatHistoryModel(
-            user_id=current_user.id,
+            user_id=user_id,
             original_text=text,
-            analysis_result=json.dumps(response.dict()),
-            provider_used=current_provider
+            analysis_result=orjson.dumps(response_data).decode(),
+            provider_used=provider or _current_provider()
         )
         db.add(chat_history)
         db.commit()
-        print(f"✅ Chat history saved for user {current_user.id}")
+        print(f"✅ Chat history saved for user {user_id}")
     except Exception as e:
         print(f"⚠️ Failed to save chat history: {e}")
         # Don't fail the request if history saving fails
+
+def _save_chat_history_in_new_session(user_id: int, text: str, response_data: Dict[str, Any], provider: Optional[str]):
+    """Save an analysis to chat history on a short-lived session"""
+    db = get_session_factory()()
+    try:
+        _save_chat_history(db, user_id, text, response_data, provider)
+    finally:
+        db.close()
+
+@app.post("/analyze", response_model=AnalyzeResponse)
+async def analyze_text(request: AnalyzeRequest, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Analyze text for bias using AI with automatic fallback"""
+    text, sentences = _split_sentences(request.text)
+    
+    # Serve repeated submissions of the same text from the analysis cache
+    cache_key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+    cached = _analysis_cache.get(cache_key)
+    if cached is None:
+        response, provider = await _run_analysis(text, sentences)
+        response_data = response.dict()
+        # Only cache real provider answers, not the all-unbiased fallback
+        if provider:
+            _analysis_cache[cache_key] = (response_data, provider)
+    else:
+        response_data, provider = cached
     
-    return response
+    # Save to chat history
+    _save_chat_history(db, current_user.id, text, response_data, provider)
+    
+    # The sentences were validated as they were built; returning a response
+    # directly skips a second validation pass against response_model
+    return ORJSONResponse(response_data)
+
+@app.post("/analyze/stream")
+async def analyze_text_stream(request: AnalyzeRequest, current_user: User = Depends(get_current_user)):
+    """Analyze text like /analyze, streaming newline-delimited JSON as sentences finish
+
+    Each {"index": i, "sentence": {...}} line carries one sentence analysis, in
+    completion order. The final line is {"summary": {...}, "provider": ...}.
+    """
+    text, sentences = _split_sentences(request.text)
+    cache_key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+    async def stream():
+        cached = _analysis_cache.get(cache_key)
+        if cached is not None:
+            response_data, provider = cached
+            for index, sentence_data in enumerate(response_data["sentences"]):
+                yield orjson.dumps({"index": index, "sentence": sentence_data}) + b"\n"
+        else:
+            provider = None
+            all_analyzed = True
+            analyzed: List[Optional[SentenceAnalysis]] = [None] * len(sentences)
+            async for step_provider, results, complete in _analyze_sentences(sentences):
+                all_analyzed = all_analyzed and complete
+                provider = provider or step_provider
+                for index, sentence_analysis in results:
+                    analyzed[index] = sentence_analysis
+                    yield orjson.dumps({"index": index, "sentence": sentence_analysis.dict()}) + b"\n"
+
+            # Sentences nobody analyzed are emitted last, as unbiased
+            sentence_analyses = []
+            for index, (sentence_analysis, sentence) in enumerate(zip(analyzed, sentences)):
+                if sentence_analysis is None:
+                    sentence_analysis = _unbiased(sentence)
+                    yield orjson.dumps({"index": index, "sentence": sentence_analysis.dict()}) + b"\n"
+                sentence_analyses.append(sentence_analysis)
+
+            response_data = AnalyzeResponse(
+                original_text=text,
+                summary=_summarize(sentence_analyses),
+                sentences=sentence_analyses
+            ).dict()
+            provider = provider if all_analyzed else None
+            if provider:
+                _analysis_cache[cache_key] = (response_data, provider)
+
+        yield orjson.dumps({"summary": response_data["summary"], "provider": provider or _current_provider()}) + b"\n"
+
+        # The request's dependencies are torn down before a streamed body
+        # runs, so history is saved on a session of its own, off the event loop
+        await asyncio.to_thread(_save_chat_history_in_new_session, current_user.id, text, response_data, provider)
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.post("/cache/invalidate", dependencies=[Depends(require_admin_token)])
+async def invalidate_analysis_cache():
+    """Drop all cached analysis results (ops only)"""
+    cleared_count = len(_analysis_cache) + len(_sentence_cache)
+    _analysis_cache.clear()
+    _sentence_cache.clear()
+    return {"message": f"Cleared {cleared_count} cached analyses"}
 
 @app.get("/status")
 async def get_status():
     """Get current AI provider status"""
-    global current_provider, gemini_quota_exceeded
-    
     status_info = {
-        "current_provider": current_provider,
+        "current_provider": _current_provider(),
         "gemini_available": gemini_model is not None,
-        "gemini_quota_exceeded": gemini_quota_exceeded,
+        "gemini_quota_exceeded": _gemini_circuit_open(),
+        "gemini_retry_in": max(gemini_retry_at - time.monotonic(), 0.0),
         "groq_available": groq_client is not None,
         "fallback_enabled": groq_client is not None
     }
@@ -673,8 +1120,8 @@ async def get_chat_history(
         history_response = []
         for item in history_items:
             try:
-                analysis_result = json.loads(item.analysis_result)
-            except json.JSONDecodeError:
+                analysis_result = orjson.loads(item.analysis_result)
+            except orjson.JSONDecodeError:
                 analysis_result = {"error": "Failed to parse analysis result"}
             
             history_response.append(ChatHistoryItem(
@@ -1,15 +1,47 @@
 #!/usr/bin/env python3
 """
 Simple startup script for Oratio Backend
+Set ENV=dev for a single auto-reloading worker
 """
 
+import os
+from importlib.util import find_spec
+
 import uvicorn
 
+
+def create_schema_once():
+    """Create the schema before the workers start so they don't race CREATE TABLE"""
+    from config import get_settings
+    if not get_settings().db_auto_create_schema:
+        return
+    from main import get_engine, init_database
+    init_database()
+    get_engine().dispose()  # Workers open their own pools
+    os.environ["DB_AUTO_CREATE_SCHEMA"] = "false"
+
+
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
+    if os.getenv("ENV") == "dev":
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,
+            log_level="info"
+        )
+    else:
+        workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+        # Workers inherit the environment, so each sizes its share of the pool
+        os.environ["WEB_CONCURRENCY"] = str(workers)
+        create_schema_once()
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=workers,
+            # uvloop is not available on Windows; fall back to the stdlib stack
+            loop="uvloop" if find_spec("uvloop") else "asyncio",
+            http="httptools" if find_spec("httptools") else "h11",
+            log_level="info"
+        )
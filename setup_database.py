@@ -6,24 +6,26 @@ Creates the MySQL database and tables
 
 import os
 import pymysql
-from config import MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE
+from config import get_settings
+
+settings = get_settings()
 
 def create_database():
     """Create the MySQL database if it doesn't exist"""
     try:
         # Connect to MySQL server (without specifying database)
         connection = pymysql.connect(
-            host=MYSQL_HOST,
-            port=int(MYSQL_PORT),
-            user=MYSQL_USER,
-            password=MYSQL_PASSWORD,
+            host=settings.mysql_host,
+            port=int(settings.mysql_port),
+            user=settings.mysql_user,
+            password=settings.mysql_password,
             charset='utf8mb4'
         )
         
         with connection.cursor() as cursor:
             # Create database if it doesn't exist
-            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {MYSQL_DATABASE}")
-            print(f"✅ Database '{MYSQL_DATABASE}' created or already exists")
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {settings.mysql_database}")
+            print(f"✅ Database '{settings.mysql_database}' created or already exists")
             
         connection.close()
         
@@ -57,6 +59,6 @@ if __name__ == "__main__":
     
     print("=" * 40)
     print("✅ Database setup complete!")
-    print(f"Database: {MYSQL_DATABASE}")
-    print(f"Host: {MYSQL_HOST}:{MYSQL_PORT}")
-    print(f"User: {MYSQL_USER}")
+    print(f"Database: {settings.mysql_database}")
+    print(f"Host: {settings.mysql_host}:{settings.mysql_port}")
+    print(f"User: {settings.mysql_user}")
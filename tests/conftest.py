@@ -0,0 +1,8 @@
+"""
+Shared test setup for Oratio Backend
+"""
+
+import os
+
+# Settings refuse to load without a signing key; main reads them at import
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
@@ -0,0 +1,37 @@
+"""
+Tests for the ops-only admin endpoints
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+# Not used as a context manager, so lifespan (database, providers) never runs
+client = TestClient(main.app)
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    monkeypatch.setattr(main, "settings", main.settings.model_copy(update={"admin_token": "ops-token"}))
+    return "ops-token"
+
+
+def test_cache_invalidate_is_disabled_without_a_configured_token():
+    response = client.post("/cache/invalidate", headers={"X-Admin-Token": ""})
+    assert response.status_code == 403
+
+
+def test_cache_invalidate_rejects_a_user_token(admin_token):
+    user_token = main.create_access_token({"sub": "user@example.com", "uid": 1})
+    response = client.post("/cache/invalidate", headers={"Authorization": f"Bearer {user_token}"})
+    assert response.status_code == 403
+
+
+def test_cache_invalidate_clears_caches_for_ops(admin_token):
+    main._sentence_cache[("groq", "cached sentence")] = b"{}"
+
+    response = client.post("/cache/invalidate", headers={"X-Admin-Token": admin_token})
+
+    assert response.status_code == 200
+    assert len(main._sentence_cache) == 0
@@ -0,0 +1,94 @@
+"""
+Tests for per-request analysis and what counts as a cacheable provider answer
+"""
+
+import pytest
+
+import main
+from main import _run_analysis
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    main._sentence_cache.clear()
+    yield
+    main._sentence_cache.clear()
+
+
+@pytest.fixture
+def respond(monkeypatch):
+    """Install a provider stub; the test passes a function from sentences to entries"""
+    def install(entries_for, provider="groq"):
+        async def fake_fallback(sentences):
+            return {"sentences": entries_for(sentences)}, provider
+        monkeypatch.setattr(main, "analyze_text_with_fallback", fake_fallback)
+    return install
+
+
+def _entry(sentence, spans=()):
+    return {"sentence": sentence, "biased_spans": list(spans), "suggestion": f"fixed {sentence}"}
+
+
+SENTENCES = ["Women are bad drivers", "Old people hate change"]
+
+
+async def test_full_answer_is_reported_with_its_provider(respond):
+    respond(lambda sentences: [_entry(s) for s in sentences])
+
+    response, provider = await _run_analysis(". ".join(SENTENCES), SENTENCES)
+
+    assert provider == "groq"
+    assert [s.suggestion for s in response.sentences] == [f"fixed {s}" for s in SENTENCES]
+
+
+@pytest.mark.parametrize("entries_for", [
+    lambda sentences: [],  # unparseable output
+    lambda sentences: [_entry(sentences[0])],  # short answer
+    lambda sentences: [_entry(s) for s in reversed(sentences)],  # misaligned answer
+    lambda sentences: [None for s in sentences],  # null entries
+])
+async def test_unanswered_sentences_make_the_result_uncacheable(respond, entries_for):
+    respond(entries_for)
+
+    response, provider = await _run_analysis(". ".join(SENTENCES), SENTENCES)
+
+    assert provider is None
+    assert len(response.sentences) == len(SENTENCES)
+
+
+async def test_skipped_sentences_fall_back_locally(respond, monkeypatch):
+    monkeypatch.setattr(main, "settings", main.settings.model_copy(update={"bias_prefilter_enabled": True}))
+    respond(lambda sentences: pytest.fail("prefiltered sentence reached a provider"))
+
+    response, provider = await _run_analysis("The meeting starts at noon", ["The meeting starts at noon"])
+
+    assert provider == "local"
+    assert response.sentences[0].biased_spans == []
+
+
+async def test_sentence_cache_only_serves_the_exact_sentence(respond, monkeypatch):
+    calls = []
+
+    def entries_for(sentences):
+        calls.append(list(sentences))
+        return [_entry(s, [{"text": "Women", "start": 0, "end": 5, "type": "gender_bias"}]) for s in sentences]
+
+    respond(entries_for)
+    monkeypatch.setattr(main, "groq_client", object())  # Makes Groq the active provider
+
+    await _run_analysis("Women are bad drivers", ["Women are bad drivers"])
+    cached, _ = await _run_analysis("Women are bad drivers", ["Women are bad drivers"])
+    respelled, _ = await _run_analysis("WOMEN  are bad drivers", ["WOMEN  are bad drivers"])
+
+    assert calls == [["Women are bad drivers"], ["WOMEN  are bad drivers"]]
+    assert cached.sentences[0].sentence == "Women are bad drivers"
+    assert respelled.sentences[0].suggestion == "fixed WOMEN  are bad drivers"
+
+
+async def test_gemini_entries_are_validated(respond):
+    respond(lambda sentences: [_entry(s, [{"text": "Women", "start": 0}]) for s in sentences], provider="gemini")
+
+    response, provider = await _run_analysis("Women are bad drivers", ["Women are bad drivers"])
+
+    assert provider is None
+    assert response.sentences[0].biased_spans == []
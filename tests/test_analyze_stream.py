@@ -0,0 +1,149 @@
+"""
+Tests for the streaming /analyze/stream endpoint
+"""
+
+import asyncio
+import threading
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+# Not used as a context manager, so lifespan (database, providers) never runs
+client = TestClient(main.app)
+
+SENTENCES = ["Women are bad drivers", "Old people hate change"]
+TEXT = ". ".join(SENTENCES) + "."
+
+
+class FakeSession:
+    """Records what the endpoint commits and on which thread"""
+
+    def __init__(self, saved):
+        self.saved = saved
+
+    def add(self, item):
+        self.saved.append(item)
+
+    def commit(self):
+        self.saved.append(("commit", threading.current_thread() is threading.main_thread()))
+
+    def close(self):
+        self.saved.append("close")
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    main._analysis_cache.clear()
+    main._sentence_cache.clear()
+    yield
+    main._analysis_cache.clear()
+    main._sentence_cache.clear()
+
+
+@pytest.fixture
+def saved(monkeypatch):
+    saved = []
+    monkeypatch.setattr(main, "get_session_factory", lambda: lambda: FakeSession(saved))
+    return saved
+
+
+@pytest.fixture
+def respond(monkeypatch):
+    """Install a provider stub; the test passes a function from sentences to entries"""
+    calls = []
+
+    def install(entries_for):
+        async def fake_fallback(sentences):
+            calls.append(list(sentences))
+            return {"sentences": entries_for(sentences)}, "groq"
+        monkeypatch.setattr(main, "analyze_text_with_fallback", fake_fallback)
+        return calls
+    return install
+
+
+def _entry(sentence):
+    return {
+        "sentence": sentence,
+        "biased_spans": [{"text": sentence.split()[0], "start": 0, "end": len(sentence.split()[0]), "type": "bias"}],
+        "suggestion": f"fixed {sentence}",
+    }
+
+
+def _stream(text=TEXT):
+    token = main.create_access_token({"sub": "user@example.com", "uid": 7})
+    response = client.post("/analyze/stream", json={"text": text}, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    return [orjson.loads(line) for line in response.content.splitlines()]
+
+
+def test_streams_one_line_per_sentence_then_the_summary(respond, saved):
+    respond(lambda sentences: [_entry(s) for s in sentences])
+
+    lines = _stream()
+
+    assert sorted(line["index"] for line in lines[:-1]) == [0, 1]
+    by_index = {line["index"]: line["sentence"] for line in lines[:-1]}
+    assert by_index[1]["suggestion"] == "fixed Old people hate change"
+    assert lines[-1] == {"summary": {"biased_count": 2, "score": 1.0}, "provider": "groq"}
+
+
+def test_unanswered_sentences_are_emitted_last_as_unbiased(respond, saved):
+    respond(lambda sentences: [_entry(sentences[0])])
+
+    lines = _stream()
+
+    assert [line["index"] for line in lines[:-1]] == [0, 1]
+    assert lines[1]["sentence"] == {"sentence": SENTENCES[1], "biased_spans": [], "suggestion": SENTENCES[1]}
+    assert lines[-1]["summary"] == {"biased_count": 1, "score": 0.5}
+    # A partial answer is not cached
+    assert len(main._analysis_cache) == 0
+
+
+def test_cached_text_is_replayed_without_calling_a_provider(respond, saved):
+    calls = respond(lambda sentences: [_entry(s) for s in sentences])
+    first = _stream()
+
+    replay = _stream()
+
+    assert calls == [SENTENCES]
+    assert [line["index"] for line in replay[:-1]] == [0, 1]
+    assert replay[-1] == first[-1]
+
+
+def test_history_is_saved_on_its_own_session_off_the_event_loop(respond, saved):
+    respond(lambda sentences: [_entry(s) for s in sentences])
+
+    _stream()
+
+    history, commit, close = saved
+    assert history.user_id == 7
+    assert orjson.loads(history.analysis_result)["summary"]["biased_count"] == 2
+    assert commit == ("commit", False)
+    assert close == "close"
+
+
+async def test_closing_the_stream_cancels_outstanding_batches(monkeypatch):
+    monkeypatch.setattr(main, "settings", main.settings.model_copy(update={"analyze_batch_size": 1}))
+    cancelled = asyncio.Event()
+
+    async def fake_fallback(sentences):
+        if sentences == SENTENCES[1:]:
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        return {"sentences": [_entry(s) for s in sentences]}, "groq"
+
+    monkeypatch.setattr(main, "analyze_text_with_fallback", fake_fallback)
+    steps = main._analyze_sentences(SENTENCES)
+
+    provider, results, complete = await steps.__anext__()
+    await steps.aclose()  # What a client disconnect does to the response body
+
+    assert (provider, [index for index, _ in results], complete) == ("groq", [0], True)
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
@@ -0,0 +1,135 @@
+"""
+Tests for SentenceBatcher packing and result alignment
+"""
+
+import asyncio
+
+import pytest
+
+import main
+from main import SentenceBatcher
+
+
+def _echo(sentences, provider="gemini"):
+    """Provider result with one well-formed entry per sentence"""
+    return {
+        "sentences": [
+            {"sentence": sentence, "biased_spans": [], "suggestion": f"fixed {sentence}"}
+            for sentence in sentences
+        ]
+    }, provider
+
+
+class FakeProvider:
+    """Stands in for analyze_text_with_fallback and records every call"""
+
+    def __init__(self):
+        self.calls = []
+        self.respond = _echo
+        self.gate = None  # Set to an asyncio.Event to hold calls until it is set
+
+    async def __call__(self, sentences):
+        self.calls.append(list(sentences))
+        if self.gate:
+            await self.gate.wait()
+        return self.respond(sentences)
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    fake = FakeProvider()
+    monkeypatch.setattr(main, "analyze_text_with_fallback", fake)
+    return fake
+
+
+@pytest.fixture
+async def batcher():
+    batcher = SentenceBatcher(max_sentences=10, max_wait=0.05)
+    batcher.start()
+    yield batcher
+    await batcher.stop()
+
+
+def _suggestions(result):
+    analysis, _ = result
+    return [entry["suggestion"] for entry in analysis["sentences"]]
+
+
+async def test_lone_request_is_sent_without_waiting(provider):
+    batcher = SentenceBatcher(max_sentences=10, max_wait=30)
+    batcher.start()
+    try:
+        result = await asyncio.wait_for(batcher.submit(["a"]), timeout=1)
+    finally:
+        await batcher.stop()
+    assert _suggestions(result) == ["fixed a"]
+    assert provider.calls == [["a"]]
+
+
+async def test_aligned_pack_is_split_by_request(provider, batcher):
+    provider.gate = asyncio.Event()
+    # The first request goes out alone; the next two queue behind it and are packed
+    first = asyncio.ensure_future(batcher.submit(["a"]))
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(batcher.submit(["b", "c"]))
+    third = asyncio.ensure_future(batcher.submit(["d"]))
+    await asyncio.sleep(0.1)
+    provider.gate.set()
+
+    assert _suggestions(await first) == ["fixed a"]
+    assert _suggestions(await second) == ["fixed b", "fixed c"]
+    assert _suggestions(await third) == ["fixed d"]
+    assert provider.calls == [["a"], ["b", "c", "d"]]
+
+
+@pytest.mark.parametrize("mangle", [
+    lambda entries: entries[1:],  # dropped entry
+    lambda entries: entries[1:] + entries[:1],  # reordered entries
+    lambda entries: entries + entries[:1],  # extra entry
+])
+async def test_misaligned_pack_is_resent_per_request(provider, batcher, mangle):
+    def respond(sentences):
+        analysis, provider = _echo(sentences)
+        if len(sentences) > 1:
+            analysis["sentences"] = mangle(analysis["sentences"])
+        return analysis, provider
+
+    provider.respond = respond
+    results = await asyncio.gather(batcher.submit(["a"]), batcher.submit(["b"]))
+
+    assert [_suggestions(result) for result in results] == [["fixed a"], ["fixed b"]]
+    assert provider.calls[0] == ["a", "b"]
+    assert sorted(provider.calls[1:]) == [["a"], ["b"]]
+
+
+async def test_provider_error_fails_every_request_in_the_pack(provider, batcher):
+    def respond(sentences):
+        raise RuntimeError("provider down")
+
+    provider.respond = respond
+    results = await asyncio.gather(
+        batcher.submit(["a"]), batcher.submit(["b"]), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+async def test_stop_fails_queued_requests(provider):
+    batcher = SentenceBatcher(max_sentences=10, max_wait=0.05)
+    batcher._task = asyncio.create_task(asyncio.sleep(30))  # Started, but never collecting
+    pending = asyncio.ensure_future(batcher.submit(["a"]))
+    await asyncio.sleep(0)
+    await batcher.stop()
+
+    with pytest.raises(RuntimeError, match="stopped"):
+        await pending
+    assert provider.calls == []
+
+
+def test_results_aligned_requires_one_echo_per_sentence():
+    entries = _echo(["Women are bad drivers", "ok"])[0]["sentences"]
+    entries[0]["sentence"] = "women are bad drivers."
+
+    assert main._results_aligned(["Women are bad drivers", "ok"], entries)
+    assert not main._results_aligned(["Women are bad drivers", "ok"], entries[:1])
+    assert not main._results_aligned(["ok", "Women are bad drivers"], entries)
@@ -0,0 +1,47 @@
+"""
+Tests for the bias marker prefilter
+"""
+
+import pytest
+
+from bias_lexicon import has_bias_marker
+
+
+@pytest.mark.parametrize("sentence", [
+    # Gender
+    "Women are too emotional to lead",
+    "He is a typical bossy manager",
+    # Age
+    "Old people can't learn new technology",
+    # Ability
+    "That idea is crazy",
+    # Race, ethnicity and nationality
+    "Mexicans are criminals",
+    "Chinese people eat anything",
+    "Immigrants are stealing our jobs",
+    "The French are rude",
+    # Religion
+    "Muslims are terrorists",
+    # Sexual orientation and gender identity
+    "Gay people should not adopt",
+    "Trans women are not real women",
+    "Being lesbian is just a phase",
+    # Socioeconomic
+    "Poor people are lazy",
+    # Generalizations
+    "They always cheat",
+    # Slurs
+    "Get out of here, you redneck",
+])
+def test_biased_sentences_are_flagged(sentence):
+    assert has_bias_marker(sentence)
+
+
+@pytest.mark.parametrize("sentence", [
+    "The meeting starts at noon",
+    "Please send the report by Friday",
+    "Our team shipped the release on time",
+    "The transfer was completed successfully",
+])
+def test_neutral_sentences_are_not_flagged(sentence):
+    assert not has_bias_marker(sentence)
@@ -0,0 +1,123 @@
+"""
+Tests for the timed Gemini circuit breaker and provider fallback
+"""
+
+import time
+
+import pytest
+from fastapi import HTTPException
+
+import main
+
+
+class Clock:
+    """Stands in for the time module in main, with a hand-driven monotonic clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return time.time()
+
+
+class FakeProvider:
+    """Counts calls and returns an analysis, or raises the configured error"""
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.error = None
+
+    async def __call__(self, sentences):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return {"sentences": [], "from": self.name}
+
+
+QUOTA_ERROR = HTTPException(status_code=503, detail="API quota exceeded. Please try again later when your quota resets.")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(main, "time", clock)
+    monkeypatch.setattr(main, "gemini_retry_at", 0.0)
+    return clock
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    fake = FakeProvider("gemini")
+    monkeypatch.setattr(main, "gemini_model", object())
+    monkeypatch.setattr(main, "analyze_text_with_gemini", fake)
+    return fake
+
+
+@pytest.fixture
+def groq(monkeypatch):
+    fake = FakeProvider("groq")
+    monkeypatch.setattr(main, "groq_client", object())
+    monkeypatch.setattr(main, "analyze_text_with_groq", fake)
+    return fake
+
+
+async def test_quota_error_opens_the_circuit(clock, gemini, groq):
+    gemini.error = QUOTA_ERROR
+
+    analysis, provider = await main.analyze_text_with_fallback(["a"])
+
+    assert (analysis["from"], provider) == ("groq", "groq")
+    assert main._gemini_circuit_open()
+    assert main._current_provider() == "groq"
+    assert (await main.get_status())["gemini_retry_in"] == main.settings.gemini_cooldown_seconds
+
+
+async def test_cooldown_skips_gemini(clock, gemini, groq):
+    gemini.error = QUOTA_ERROR
+    await main.analyze_text_with_fallback(["a"])
+
+    clock.now += main.settings.gemini_cooldown_seconds - 1
+    _, provider = await main.analyze_text_with_fallback(["b"])
+
+    assert provider == "groq"
+    assert (gemini.calls, groq.calls) == (1, 2)
+
+
+async def test_gemini_is_tried_again_after_the_cooldown(clock, gemini, groq):
+    gemini.error = QUOTA_ERROR
+    await main.analyze_text_with_fallback(["a"])
+
+    clock.now += main.settings.gemini_cooldown_seconds
+    # The active provider follows the circuit without waiting for a Gemini success
+    assert main._current_provider() == "gemini"
+    assert (await main.get_status())["current_provider"] == "gemini"
+
+    gemini.error = None
+    _, provider = await main.analyze_text_with_fallback(["b"])
+
+    assert provider == "gemini"
+    assert (gemini.calls, groq.calls) == (2, 1)
+
+
+async def test_failing_call_costs_one_attempt_per_provider(clock, gemini, groq):
+    gemini.error = QUOTA_ERROR
+    groq.error = RuntimeError("groq down")
+
+    with pytest.raises(HTTPException) as excinfo:
+        await main.analyze_text_with_fallback(["a"])
+
+    assert excinfo.value.status_code == 503
+    assert (gemini.calls, groq.calls) == (1, 1)
+
+
+async def test_other_gemini_errors_fall_back_without_opening_the_circuit(clock, gemini, groq):
+    gemini.error = RuntimeError("bad gateway")
+
+    _, provider = await main.analyze_text_with_fallback(["a"])
+
+    assert provider == "groq"
+    assert not main._gemini_circuit_open()
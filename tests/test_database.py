@@ -0,0 +1,41 @@
+"""
+Tests for database startup helpers
+"""
+
+import main
+
+
+class FakeConnection:
+    def __init__(self, fail):
+        self.fail = fail
+        self.closed = False
+
+    def execute(self, statement):
+        if self.fail:
+            raise RuntimeError("Too many connections")
+
+    def close(self):
+        self.closed = True
+
+
+class FakeEngine:
+    """Engine whose third connection fails its warm-up query"""
+
+    def __init__(self, size):
+        self.pool = type("Pool", (), {"size": lambda _: size})()
+        self.connections = []
+
+    def connect(self):
+        connection = FakeConnection(fail=len(self.connections) == 2)
+        self.connections.append(connection)
+        return connection
+
+
+def test_warm_connection_pool_closes_connections_after_a_failure(monkeypatch):
+    engine = FakeEngine(size=5)
+    monkeypatch.setattr(main, "get_engine", lambda: engine)
+
+    main.warm_connection_pool()
+
+    assert len(engine.connections) == 3
+    assert all(connection.closed for connection in engine.connections)
@@ -0,0 +1,59 @@
+"""
+Tests for reading Gemini's streamed JSON output
+"""
+
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+from main import _read_json_stream
+
+
+class FakeStream:
+    """Async iterable of text chunks that records how far it was read"""
+
+    def __init__(self, *pieces):
+        self.pieces = pieces
+        self.consumed = 0
+
+    async def __aiter__(self):
+        for piece in self.pieces:
+            self.consumed += 1
+            yield SimpleNamespace(text=piece)
+
+
+async def test_single_chunk_object():
+    assert await _read_json_stream(FakeStream('{"a": 1}')) == '{"a": 1}'
+
+
+async def test_braces_and_escaped_quotes_inside_strings():
+    document = '{"text": "a } b { c \\" } \\\\", "n": {"x": "}"}}'
+    assert orjson.loads(await _read_json_stream(FakeStream(document)))["n"] == {"x": "}"}
+    assert await _read_json_stream(FakeStream(document)) == document
+
+
+async def test_text_before_the_object_is_dropped():
+    assert await _read_json_stream(FakeStream('```json\n{"a": ', '1}')) == '{"a": 1}'
+
+
+async def test_closing_brace_split_across_chunks():
+    stream = FakeStream('{"a": {"b": "}', '"', '}', '}', '\n```')
+    assert await _read_json_stream(stream) == '{"a": {"b": "}"}}'
+
+
+async def test_stream_is_drained_after_the_object_closes():
+    stream = FakeStream('{"a": 1}', ' trailing', ' output')
+    assert await _read_json_stream(stream) == '{"a": 1}'
+    assert stream.consumed == 3
+
+
+async def test_stream_without_an_object_is_returned_whole():
+    text = await _read_json_stream(FakeStream("no json ", "here"))
+    assert text == "no json here"
+    with pytest.raises(orjson.JSONDecodeError):
+        orjson.loads(text)
+
+
+async def test_unterminated_object_is_returned_whole():
+    assert await _read_json_stream(FakeStream('{"a": ', '"}')) == '{"a": "}'